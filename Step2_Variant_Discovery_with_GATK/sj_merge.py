@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+This script merges the per-sample splice junction files (SJ.out.tab) of the STAR first pass.
+Junctions are aggregated with a streaming k-way merge that sums, for every junction, the number
+of uniquely mapped reads over all samples and counts the samples supporting it with unique reads.
+Only the junctions passing the support thresholds are written.
+"""
+
+import os
+import sys
+import heapq
+import argparse
+
+SJ_SUFFIX = "_SJ.out.tab"
+
+
+def load_chrom_order(path):
+    """
+    Build the sort key for chromosome names.
+
+    Args:
+        path (str): STAR chrName.txt giving the genome order
+
+    Returns:
+        callable: Function mapping a chromosome name to its sort key
+    """
+    with open(path) as fh:
+        rank = {line.strip(): i for i, line in enumerate(fh) if line.strip()}
+
+    def chrom_key(chrom):
+        if chrom not in rank:
+            raise ValueError(f"Chromosome {chrom} is not listed in {path}")
+        return rank[chrom]
+
+    return chrom_key
+
+
+def read_junctions(path, chrom_key):
+    """
+    Stream the junctions of a sorted STAR SJ.out.tab.
+
+    Args:
+        path (str): Path to the junction file
+        chrom_key (callable): Sort key for chromosome names
+
+    Yields:
+        tuple: (sort key, chrom, start, end, strand, unique reads, supporting samples)
+    """
+    previous = None
+    with open(path) as fh:
+        for line in fh:
+            fields = line.rstrip("\n").split("\t")
+            chrom, start, end, strand = fields[0], int(fields[1]), int(fields[2]), fields[3]
+            key = (chrom_key(chrom), start, end, strand)
+            if previous is not None and key < previous:
+                raise ValueError(f"{path} is not sorted by chromosome and position "
+                                 f"(check that --chrom-order is the chrName.txt of its genome)")
+            previous = key
+            unique = int(fields[6])
+            yield key, chrom, start, end, strand, unique, 1 if unique > 0 else 0
+
+
+def merge_junctions(streams):
+    """
+    K-way merge of sorted junction streams, summing the support of identical junctions.
+
+    Args:
+        streams (list): Iterators as returned by read_junctions
+
+    Yields:
+        tuple: (chrom, start, end, strand, unique reads, supporting samples)
+    """
+    current = None
+    for key, chrom, start, end, strand, unique, samples in heapq.merge(*streams, key=lambda j: j[0]):
+        if current is not None and current[0] == key:
+            current[5] += unique
+            current[6] += samples
+            continue
+        if current is not None:
+            yield tuple(current[1:])
+        current = [key, chrom, start, end, strand, unique, samples]
+    if current is not None:
+        yield tuple(current[1:])
+
+
+def sample_name(path):
+    """Derive the sample name from a STAR SJ.out.tab path."""
+    name = os.path.basename(path)
+    return name[:-len(SJ_SUFFIX)] if name.endswith(SJ_SUFFIX) else name
+
+
+def write_junctions(junctions, output_path, min_unique, min_samples):
+    """
+    Write the junctions that pass the support thresholds.
+
+    Args:
+        junctions (iterable): Tuples (chrom, start, end, strand, unique reads, supporting samples)
+        output_path (str): Path to the merged junction file (chrom, start, end, strand)
+        min_unique (int): Minimum number of unique reads summed over the cohort
+        min_samples (int): Minimum number of samples supporting the junction
+
+    Returns:
+        int: Number of junctions written
+    """
+    count = 0
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w") as out:
+        for chrom, start, end, strand, unique, samples in junctions:
+            if unique >= min_unique and samples >= min_samples:
+                out.write(f"{chrom}\t{start}\t{end}\t{strand}\n")
+                count += 1
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def merge_files(sj_files, output_path, chrom_key, min_unique, min_samples):
+    """
+    Merge per-sample junction files in one pass and write the junctions passing the thresholds.
+
+    Args:
+        sj_files (list): Paths to STAR SJ.out.tab files
+        output_path (str): Path to the merged junction file (chrom, start, end, strand)
+        chrom_key (callable): Sort key for chromosome names
+        min_unique (int): Minimum number of unique reads summed over the samples
+        min_samples (int): Minimum number of samples supporting the junction
+
+    Returns:
+        int: Number of junctions written
+    """
+    names = [sample_name(path) for path in sj_files]
+    duplicates = sorted(set(name for name in names if names.count(name) > 1))
+    if duplicates:
+        raise ValueError(f"Samples given more than once: {', '.join(duplicates)}")
+    streams = [read_junctions(path, chrom_key) for path in sj_files]
+    return write_junctions(merge_junctions(streams), output_path, min_unique, min_samples)
+
+
+def main():
+    """
+    Main function to parse arguments and merge the junction files.
+    """
+    parser = argparse.ArgumentParser(description='Merge STAR splice junction files across samples')
+    parser.add_argument('sj_files', nargs='+', help='Per-sample SJ.out.tab files')
+    parser.add_argument('--chrom-order', type=str, required=True,
+                        help="STAR chrName.txt giving the chromosome order of the SJ files")
+    parser.add_argument('--output', type=str, required=True,
+                        help='Merged junction file (chrom, start, end, strand)')
+    parser.add_argument('--min-unique', type=int, default=3,
+                        help='Minimum unique reads summed over the cohort (default: 3)')
+    parser.add_argument('--min-samples', type=int, default=1,
+                        help='Minimum number of supporting samples (default: 1)')
+
+    args = parser.parse_args()
+
+    try:
+        kept = merge_files(args.sj_files, args.output, load_chrom_order(args.chrom_order),
+                           args.min_unique, args.min_samples)
+        print(f"Wrote {kept} junctions from {len(args.sj_files)} samples to {args.output}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+#!/bin/bash
+# Streamed QC + trimming front end for a single-end FASTQ file.
+# The raw FASTQ is decompressed once, trimmed with cutadapt using the Trim Galore settings
+# of the pipeline (--illumina -q 20 --phred33 --length 20) and the trimmed reads are written
+# to stdout, so they can be piped or FIFO-streamed straight into STAR.
+# When a QC directory is given, FastQC runs as a side tap on the same raw stream.
+#
+# Usage: stream_frontend.sh <reads.fastq.gz> <trimming_report> [<qc_dir> <sample_name>]
+# CUTADAPT_CORES sets the number of cutadapt workers (default: 4).
+set -euo pipefail
+
+FASTQ=$1
+REPORT=$2
+QC_DIR=${3:-}
+NAME=${4:-}
+
+CUTADAPT=/home/gdurmaz/miniconda3/envs/snakemake_env/bin/cutadapt
+FASTQC=/home/gdurmaz/miniconda3/envs/snakemake_env/bin/fastqc
+
+# Trim Galore defaults: Illumina adapter, stringency 1, error rate 0.1.
+# The front end runs next to STAR in the same job: zcat, tee, FastQC and CUTADAPT_CORES cutadapt
+# workers; the Snakefile gives STAR the rest of the rule's threads.
+TRIM_OPTS=(-j "${CUTADAPT_CORES:-4}" -a AGATCGGAAGAGC -q 20 --quality-base 33 -m 20 -O 1 -e 0.1)
+
+# Trimming only (second pass).
+if [ -z "$QC_DIR" ]; then
+    zcat "$FASTQ" | $CUTADAPT "${TRIM_OPTS[@]}" - 2> "$REPORT"
+    exit 0
+fi
+
+# Trimming with FastQC reading the same stream through a FIFO.
+QC_FIFO=$(mktemp -u "${TMPDIR:-/tmp}/${NAME}_fastqc.XXXXXX")
+mkfifo "$QC_FIFO"
+trap 'rm -f "$QC_FIFO"' EXIT
+
+$FASTQC --thread 1 --outdir "$QC_DIR" --nogroup "stdin:$NAME" < "$QC_FIFO" &
+QC_PID=$!
+
+zcat "$FASTQ" | tee "$QC_FIFO" | $CUTADAPT "${TRIM_OPTS[@]}" - 2> "$REPORT"
+
+wait $QC_PID
@@ -29,6 +29,24 @@ log_message() {
     echo "[$(date +%Y-%m-%d\ %H:%M:%S)] $1" | tee -a "$LOG_FILE"
 }
 
+# Per-sample metrics, appended as JSON lines in the same format as pipeline_metrics.py
+METRICS_LOG="${STEP3_METRICS_LOG:-step3_metrics.jsonl}"
+
+# Function to log a metrics record: stage, sample, dataset, input file, start time, output rows, status
+# The output rows are counted while samtools writes them, so the depth files are not read again.
+log_metrics() {
+    local rows_out="null"
+    local job_id="null"
+    if [ "$7" == "ok" ]; then
+        rows_out=$6
+    fi
+    if [ -n "${SLURM_JOB_ID:-}" ]; then
+        job_id="\"$SLURM_JOB_ID\""
+    fi
+    printf '{"stage": "%s", "sample": "%s", "dataset": "%s", "input": "%s", "input_bytes": %s, "rows_in": null, "rows_out": %s, "host": "%s", "job_id": %s, "status": "%s", "start": %s, "duration_s": %s, "peak_rss_mb": null, "rss_delta_mb": null}\n' \
+        "$1" "$2" "$3" "$4" "$(stat -c %s "$4")" "$rows_out" "$(hostname)" "$job_id" "$7" "$5" "$(( $(date +%s) - $5 ))" >> "$METRICS_LOG"
+}
+
 # Loop through each source directory
 for SOURCE in "${SOURCE_DIRS[@]}"
 do
@@ -57,6 +75,7 @@ do
     for BAM_FILE in "${BAM_FILES[@]}"
     do
         BAM_BASENAME=$(basename "$BAM_FILE")
+        SAMPLE=${BAM_BASENAME%_Aligned.sortedByCoord.out.bam}
         log_message "Processing $BAM_BASENAME"
         
         # Check if the index file doesn't exist and create it
@@ -79,14 +98,17 @@ do
         # Calculate coverage for UNC gene region if the file doesn't exist
         if [ ! -f "$UNC_OUTPUT" ]; then
             log_message "Calculating UNC gene coverage for $BAM_BASENAME"
-            samtools depth -a -r $UNC_REGION $BAM_FILE > "$UNC_OUTPUT.tmp"
+            START=$(date +%s)
+            ROWS=$(set -o pipefail; samtools depth -a -r $UNC_REGION $BAM_FILE | tee "$UNC_OUTPUT.tmp" | wc -l)
             # Only move the file if command was successful
             if [ $? -eq 0 ]; then
                 mv "$UNC_OUTPUT.tmp" "$UNC_OUTPUT"
                 log_message "UNC gene coverage written to $UNC_OUTPUT"
+                log_metrics "depth_unc" "$SAMPLE" "$SOURCE" "$BAM_FILE" "$START" "$ROWS" "ok"
             else
                 log_message "Error calculating UNC gene coverage for $BAM_BASENAME"
                 rm -f "$UNC_OUTPUT.tmp"
+                log_metrics "depth_unc" "$SAMPLE" "$SOURCE" "$BAM_FILE" "$START" "null" "error"
             fi
         else
             log_message "UNC gene coverage file for $BAM_BASENAME already exists, skipping"
@@ -95,14 +117,17 @@ do
         # Calculate coverage for chromosome 11 if the file doesn't exist
         if [ ! -f "$CHR_OUTPUT" ]; then
             log_message "Calculating chromosome 11 coverage for $BAM_BASENAME"
-            samtools depth -a -r $CHR_REGION $BAM_FILE > "$CHR_OUTPUT.tmp"
+            START=$(date +%s)
+            ROWS=$(set -o pipefail; samtools depth -a -r $CHR_REGION $BAM_FILE | tee "$CHR_OUTPUT.tmp" | wc -l)
             # Only move the file if command was successful
             if [ $? -eq 0 ]; then
                 mv "$CHR_OUTPUT.tmp" "$CHR_OUTPUT"
                 log_message "Chromosome 11 coverage written to $CHR_OUTPUT"
+                log_metrics "depth_chr11" "$SAMPLE" "$SOURCE" "$BAM_FILE" "$START" "$ROWS" "ok"
             else
                 log_message "Error calculating chromosome 11 coverage for $BAM_BASENAME"
                 rm -f "$CHR_OUTPUT.tmp"
+                log_metrics "depth_chr11" "$SAMPLE" "$SOURCE" "$BAM_FILE" "$START" "null" "error"
             fi
         else
             log_message "Chromosome 11 coverage file for $BAM_BASENAME already exists, skipping"
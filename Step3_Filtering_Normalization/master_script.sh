@@ -10,6 +10,13 @@ echo "==================================================="
 echo "Started at: $(date)"
 echo
 
+# All jobs append their per-sample metrics to the same JSON-lines log (inherited by sbatch).
+# Summarize it with: python pipeline_metrics.py $STEP3_METRICS_LOG
+export STEP3_METRICS_LOG="${STEP3_METRICS_LOG:-$(pwd)/logs/step3_metrics.jsonl}"
+mkdir -p "$(dirname "$STEP3_METRICS_LOG")"
+echo "Metrics log: $STEP3_METRICS_LOG"
+echo
+
 # Define the scripts to run in sequence
 SCRIPT1="./check_coverage.sh"
 SCRIPT2="./create_csv.sh"
@@ -100,6 +107,9 @@ echo
 echo "To check the status of these jobs, run:"
 echo "  squeue -u $USER"
 echo
+echo "To find slow and oversized samples once the jobs have run:"
+echo "  python pipeline_metrics.py $STEP3_METRICS_LOG"
+echo
 echo "To cancel the entire pipeline, run:"
 echo "  scancel $JOB1_ID $JOB2_ID $JOB3_ID $JOB4_ID $JOB5_ID"
 echo
@@ -0,0 +1,11 @@
+#!/usr/bin/env python
+"""
+This script summarizes the per-sample metrics log of the Step3 stages.
+Kept for the SLURM job scripts; the logic lives in variantdisc.metrics ('variantdisc metrics').
+"""
+
+import sys
+from variantdisc.metrics import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+#!/bin/bash
+
+#SBATCH --job-name=variantdisc
+#SBATCH --output=variantdisc_%j.out
+#SBATCH --error=variantdisc_%j.err
+#SBATCH --time=24:00:00
+#SBATCH --mem=20G
+#SBATCH --cpus-per-task=1
+
+# Runs convert, counts, coverage and confidence in one job and one Python process
+# (replaces create_csv.sh, create_datasets.sh, coverage.sh and confidence.sh).
+# Install the package once with: pip install -e .
+
+# Print job info
+echo "Job started at $(date)"
+echo "Running on host: $(hostname)"
+echo "Job ID: $SLURM_JOB_ID"
+
+# Set directory variables
+BASE_PATH="/work/project/ext_016/RNA-Seq-Variant-Calling_1"
+
+# Run all stages
+echo "Starting Step3 stages..."
+python -m variantdisc all --base-path ${BASE_PATH} --dirs source_dir source_dir_4 source_dir_6
+
+# Check exit status
+if [ $? -eq 0 ]; then
+    echo "Job completed successfully at $(date)"
+else
+    echo "Job failed at $(date)"
+    exit 1
+fi
+
+exit 0
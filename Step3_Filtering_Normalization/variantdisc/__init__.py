@@ -0,0 +1,10 @@
+"""
+Filtering and normalization of the RNA-seq variant calls (Step3).
+
+The stages are importable from notebooks and runnable from the 'variantdisc' command:
+convert (VCF to CSV), counts (mutation counts + metadata), coverage (coverage statistics)
+and confidence (per-variant confidence scores). Heavy dependencies (pandas, numpy) are
+imported by the stages that use them, not by the package.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,5 @@
+import sys
+
+from variantdisc.cli import main
+
+sys.exit(main())
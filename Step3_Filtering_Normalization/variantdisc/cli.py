@@ -0,0 +1,113 @@
+"""
+Command line interface of the Step3 stages:
+
+    variantdisc convert|counts|coverage|confidence|all [--base-path PATH] [--dirs DIR ...]
+    variantdisc metrics [METRICS_LOG]
+
+'all' runs convert, counts, coverage and confidence in one process, in the order of
+master_script.sh, and stops at the first stage that fails. Stage modules (and pandas) are
+only imported when their command runs.
+"""
+
+import argparse
+from variantdisc import __version__
+from variantdisc.datasets import BASE_PATH, load_datasets
+
+STAGES = ["convert", "counts", "coverage", "confidence"]
+
+
+def run_convert(args, datasets):
+    """Convert the filtered VCF files to CSV."""
+    from variantdisc import convert
+    return convert.run(args.base_path, args.dirs, args.metrics_log, args.chunk_size)
+
+
+def run_counts(args, datasets):
+    """Count the mutations per sample and merge them with the metadata."""
+    from variantdisc import counts
+    return counts.run(args.base_path, args.dirs, args.metrics_log, datasets)
+
+
+def run_coverage(args, datasets):
+    """Add the coverage statistics to the mutation counts tables."""
+    from variantdisc import coverage
+    return coverage.run(args.base_path, args.dirs, args.metrics_log, datasets)
+
+
+def run_confidence(args, datasets):
+    """Calculate the per-variant confidence scores."""
+    from variantdisc import confidence
+    return confidence.run(args.base_path, args.dirs, args.metrics_log)
+
+
+STAGE_RUNNERS = {
+    "convert": run_convert,
+    "counts": run_counts,
+    "coverage": run_coverage,
+    "confidence": run_confidence,
+}
+
+
+def run_all(args, datasets):
+    """Run every stage in one process, stopping at the first stage that fails."""
+    for stage in STAGES:
+        print(f"=== {stage} ===")
+        status = STAGE_RUNNERS[stage](args, datasets)
+        if status != 0:
+            print(f"Error: stage {stage} failed, stopping")
+            return status
+    return 0
+
+
+def build_parser():
+    """Build the argument parser of the variantdisc command."""
+    parser = argparse.ArgumentParser(prog='variantdisc',
+                                     description='Filtering and normalization of RNA-seq variant calls')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--base-path', type=str, default=BASE_PATH,
+                        help='Base path for the project')
+    common.add_argument('--dirs', type=str, nargs='+', default=None,
+                        help='List of source directories to process (default: all configured datasets)')
+    common.add_argument('--datasets', type=str, default=None,
+                        help='JSON or YAML file describing additional datasets')
+    common.add_argument('--metrics-log', type=str, default=None,
+                        help='JSON-lines metrics log (default: $STEP3_METRICS_LOG or step3_metrics.jsonl)')
+
+    for stage in STAGES + ["all"]:
+        help_text = STAGE_RUNNERS[stage].__doc__ if stage in STAGE_RUNNERS else run_all.__doc__
+        sub = subparsers.add_parser(stage, parents=[common], help=help_text)
+        if stage in ("convert", "all"):
+            sub.add_argument('--chunk-size', type=int, default=10000,
+                             help='Number of VCF lines to process at once (default: 10000)')
+
+    metrics_parser = subparsers.add_parser('metrics', help='Summarize a metrics log')
+    metrics_parser.add_argument('metrics_log', type=str, nargs='?', default=None,
+                                help='Metrics log (default: $STEP3_METRICS_LOG or step3_metrics.jsonl)')
+    metrics_parser.add_argument('--factor', type=float, default=3.0,
+                                help='Flag samples above this multiple of the stage median (default: 3.0)')
+    metrics_parser.add_argument('--top', type=int, default=10,
+                                help='Number of slowest samples to list (default: 10)')
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Main function to parse arguments and run the requested stage(s).
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "metrics":
+        from variantdisc.metrics import summarize_log
+        return summarize_log(args.metrics_log, args.factor, args.top)
+
+    datasets = load_datasets(args.datasets)
+    if args.dirs is None:
+        args.dirs = list(datasets)
+
+    if args.command == "all":
+        return run_all(args, datasets)
+    return STAGE_RUNNERS[args.command](args, datasets)
@@ -0,0 +1,207 @@
+"""
+This module calculates per-variant confidence scores (GQ, QUAL and DP) for the UNC93B1 region.
+"""
+
+import os
+import glob
+import argparse
+from variantdisc.datasets import BASE_PATH, DEFAULT_DIRS, confidence_dir, csv_dir
+from variantdisc.metrics import record_stage
+
+# Constants
+epsilon = 1e-10
+
+# UNC93B1 region used for the confidence scores
+POS_MIN = 67990100
+POS_MAX = 68005097
+
+def extract_format_values(row, sample_column):
+    """Extract GQ and DP values from FORMAT field"""
+    import pandas as pd
+
+    try:
+        format_fields = row['FORMAT'].split(':')
+        sample_values = row[sample_column].split(':')
+        format_dict = dict(zip(format_fields, sample_values))
+        
+        return pd.Series({
+            'GQ': format_dict.get('GQ', 'NA'),
+            'DP': format_dict.get('DP', 'NA')
+        })
+    except Exception as e:
+        print(f"Error extracting format values: {str(e)}")
+        return pd.Series({'GQ': 'NA', 'DP': 'NA'})
+
+def process_file(input_file, output_file, pos_min, pos_max, metrics=None):
+    """Process a single file and save the results, filling the row counts of 'metrics' if given"""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        # Get file name without extension
+        unique_file = os.path.basename(input_file).split(".")[0]
+        
+        print(f"  Reading {unique_file}...")
+        # Read the CSV file into a DataFrame
+        temp = pd.read_csv(input_file)
+        if metrics is not None:
+            metrics["rows_in"] = len(temp)
+        
+        if "POS" not in temp.columns:
+            print(f"  Warning: File {input_file} does not have a POS column. Skipping.")
+            return False, "Missing POS column"
+        
+        # Filter positions within the range
+        df = temp[(temp["POS"] >= pos_min) & (temp["POS"] <= pos_max)]
+        
+        if df.empty:
+            print(f"  Warning: No positions within range {pos_min}-{pos_max} in {input_file}. Skipping.")
+            return False, "No positions in range"
+        
+        # Extract values - using the filename as the sample column name
+        if unique_file not in df.columns:
+            print(f"  Finding sample column for {unique_file}...")
+            # Try to find a suitable sample column - often it's the last column
+            sample_columns = [col for col in df.columns if col not in ['CHROM', 'POS', 'ID', 'REF', 'ALT', 'QUAL', 'FILTER', 'INFO', 'FORMAT']]
+            if not sample_columns:
+                print(f"  Error: Could not identify sample column in {input_file}. Skipping.")
+                return False, "Could not identify sample column"
+            sample_column = sample_columns[0]
+        else:
+            sample_column = unique_file
+        
+        # Extract values
+        format_values = df.apply(lambda row: extract_format_values(row, sample_column), axis=1)
+        df = pd.concat([df, format_values], axis=1)
+        
+        # Convert to numeric
+        df['GQ'] = pd.to_numeric(df['GQ'], errors='coerce')
+        df['DP'] = pd.to_numeric(df['DP'], errors='coerce')
+        
+        # Calculate individual confidence components
+        # GQ confidence (Phred-scaled)
+        df['gq_conf'] = 1 - np.power(10, -df['GQ']/10) 
+        
+        # Cap QUAL values at 50 before calculating confidence
+        capped_qual = np.minimum(df['QUAL'], 50)
+        df['qual_conf'] = 1 - np.power(10, -capped_qual/10)
+        
+        # DP confidence (using logistic function to normalize depth)
+        df['dp_conf'] = 1 / (1 + np.exp(-0.22 * (df['DP'] - 20))) 
+        
+        # Combined confidence using weighted arithmetic mean
+        # Weights: GQ=0.4, QUAL=0.4, DP=0.2
+        df['confidence'] = (
+            0.4 * df['gq_conf'] + 
+            0.4 * df['qual_conf'] + 
+            0.2 * df['dp_conf']
+        )
+        
+        # Keep only the necessary columns
+        df = df[['POS', 'GQ', 'QUAL', 'DP', 'gq_conf', 'qual_conf', 'dp_conf', 'confidence', 'FILTER']]
+        
+        # Save the csv
+        df.to_csv(output_file, index=False)
+        if metrics is not None:
+            metrics["rows_out"] = len(df)
+        
+        return True, f"Successfully processed {os.path.basename(input_file)}"
+    except Exception as e:
+        return False, f"Error processing {input_file}: {str(e)}"
+
+def run(base_path=BASE_PATH, dirs=DEFAULT_DIRS, metrics_log=None, pos_min=POS_MIN, pos_max=POS_MAX):
+    """
+    Calculate the confidence scores of the samples of several source directories.
+    The results are written to <source_dir>/filtered/Confidence/<sample>_confidence.csv.
+    
+    Args:
+        base_path (str): Base project path
+        dirs (list): Source directory names
+        metrics_log (str): Path to the JSON-lines metrics log
+        pos_min (int): First position of the region
+        pos_max (int): Last position of the region
+    
+    Returns:
+        int: Exit status (failed files are reported in the summary)
+    """
+    # Counter for statistics
+    success_count = 0
+    skipped_count = 0
+    failed_count = 0
+    already_exists_count = 0
+    
+    # Process each source directory
+    for dir_name in dirs:
+        source_dir = csv_dir(base_path, dir_name)
+        print(f"\nProcessing directory: {source_dir}")
+        
+        # Check if directory exists
+        if not os.path.exists(source_dir):
+            print(f"Directory {source_dir} does not exist. Skipping.")
+            skipped_count += 1
+            continue
+        
+        # Create output directory if it doesn't exist
+        output_dir = confidence_dir(base_path, dir_name)
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Get list of files to process
+        file_pattern = os.path.join(source_dir, "*.csv")
+        file_list = glob.glob(file_pattern)
+        
+        if not file_list:
+            print(f"No CSV files found in {source_dir}. Skipping.")
+            skipped_count += 1
+            continue
+            
+        print(f"Found {len(file_list)} files to process")
+        
+        # Process each file
+        for input_file in file_list:
+            unique_file = os.path.basename(input_file).split(".")[0]
+            output_file = os.path.join(output_dir, f"{unique_file}_confidence.csv")
+            
+            # Check if output file already exists
+            if os.path.exists(output_file):
+                print(f"Output file for {unique_file} already exists. Skipping.")
+                already_exists_count += 1
+                continue
+            
+            print(f"Processing {unique_file}...")
+            with record_stage("confidence", unique_file, input_file, dir_name, metrics_log) as metrics:
+                success, message = process_file(input_file, output_file, pos_min, pos_max, metrics)
+                if not success:
+                    metrics["status"] = "error"
+                    metrics["error"] = message
+            
+            if success:
+                success_count += 1
+                print(f"  {message}")
+            else:
+                failed_count += 1
+                print(f"  {message}")
+    
+    # Print summary
+    print("\nSummary:")
+    print(f"Total files successfully processed: {success_count}")
+    print(f"Total files already existed and skipped: {already_exists_count}")
+    print(f"Total files skipped/failed: {skipped_count + failed_count}")
+    
+    return 0
+
+def main():
+    """
+    Main function to parse arguments and process directories.
+    """
+    parser = argparse.ArgumentParser(description='Calculate variant confidence scores')
+    parser.add_argument('--base-path', type=str, default=BASE_PATH,
+                        help='Base path for the project')
+    parser.add_argument('--dirs', type=str, nargs='+', 
+                        default=DEFAULT_DIRS,
+                        help='List of source directories to process')
+    parser.add_argument('--metrics-log', type=str, default=None,
+                        help='JSON-lines metrics log (default: $STEP3_METRICS_LOG or step3_metrics.jsonl)')
+    
+    args = parser.parse_args()
+    
+    return run(args.base_path, args.dirs, args.metrics_log)
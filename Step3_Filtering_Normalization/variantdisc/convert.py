@@ -0,0 +1,193 @@
+"""
+This module converts VCF files obtained by GATK pipeline to CSV format.
+It processes files across multiple directories: source_dir, source_dir_4, and source_dir_6.
+Memory-optimized version to avoid SLURM memory limits.
+"""
+
+import os
+import gzip
+import argparse
+import csv
+from contextlib import contextmanager
+from variantdisc.datasets import BASE_PATH, DEFAULT_DIRS, csv_dir, filtered_dir, sample_names
+from variantdisc.metrics import record_stage
+
+@contextmanager
+def open_file(path, mode):
+    """Context manager for opening files, handling gzipped files."""
+    if path.endswith('.gz'):
+        fh = gzip.open(path, mode)
+    else:
+        fh = open(path, mode)
+    try:
+        yield fh
+    finally:
+        fh.close()
+
+def process_vcf_in_chunks(input_path, output_path, chunk_size=10000):
+    """
+    Process a VCF file in chunks to reduce memory usage.
+    
+    Args:
+        input_path (str): Path to the input VCF file (gzipped)
+        output_path (str): Path to the output CSV file
+        chunk_size (int): Number of lines to process at once
+
+    Returns:
+        tuple: Number of variant lines read and number of rows written
+    """
+    # First, get the header line
+    header = None
+    with open_file(input_path, 'rt') as f:
+        for line in f:
+            if line.startswith('#') and not line.startswith('##'):
+                header = line.strip().split('\t')
+                header[0] = 'CHROM'  # Rename #CHROM to CHROM
+                break
+    
+    if not header:
+        raise ValueError(f"Could not find header in {input_path}")
+    
+    rows_in = 0
+    rows_out = 0
+
+    # Process the file in chunks
+    with open_file(input_path, 'rt') as infile, open(output_path, 'w', newline='') as outfile:
+        csv_writer = csv.writer(outfile)
+        csv_writer.writerow(header)
+        
+        # Skip header lines
+        for line in infile:
+            if line.startswith('##'):
+                continue
+            if line.startswith('#'):
+                continue  # Skip the header line we already processed
+            break
+        
+        # Process the first line that isn't a header
+        if not line.startswith('#'):
+            rows_in += 1
+            rows_out += process_line(line, csv_writer)
+        
+        # Process the rest of the file in chunks
+        chunk = []
+        for line in infile:
+            if len(chunk) >= chunk_size:
+                rows_in += len(chunk)
+                rows_out += process_chunk(chunk, csv_writer)
+                chunk = []
+            chunk.append(line)
+            
+        if chunk:  # Process the last chunk
+            rows_in += len(chunk)
+            rows_out += process_chunk(chunk, csv_writer)
+
+    return rows_in, rows_out
+
+def process_line(line, csv_writer):
+    """Process a single line of VCF data. Returns 1 if the line was written, 0 otherwise."""
+    parts = line.strip().split('\t')
+    chrom = parts[0]
+    alt = parts[4]
+    
+    # Apply filters
+    if chrom == 'chr11' and alt != '<NON_REF>':
+        csv_writer.writerow(parts)
+        return 1
+    return 0
+
+def process_chunk(chunk, csv_writer):
+    """Process a chunk of VCF lines. Returns the number of rows written."""
+    return sum(process_line(line, csv_writer) for line in chunk)
+
+def process_directory(base_path, source_dir, metrics_log=None, chunk_size=10000):
+    """
+    Process all VCF files in the specified directory and convert them to CSV.
+    
+    Args:
+        base_path (str): Base path for the project
+        source_dir (str): Source directory name (e.g., 'source_dir_4')
+        metrics_log (str): Path to the JSON-lines metrics log
+        chunk_size (int): Number of lines to process at once
+    """
+    # Create the csv_files directory if it doesn't exist
+    output_dir = csv_dir(base_path, source_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Extract unique filenames without extensions
+    unique_file_list = sample_names(filtered_dir(base_path, source_dir), "*.gz")
+    
+    print(f"Processing {len(unique_file_list)} files in {source_dir}...")
+    
+    for unique_file in unique_file_list:
+        csv_path = os.path.join(output_dir, f"{unique_file}.csv")
+        
+        # Skip if the CSV file already exists
+        if os.path.exists(csv_path):
+            print(f"Skipping {unique_file}.csv (already exists)")
+            continue
+        
+        try:
+            path_gz = os.path.join(filtered_dir(base_path, source_dir), f"{unique_file}.variant_filtered.vcf.gz")
+            
+            # Check if the file exists
+            if not os.path.exists(path_gz):
+                print(f"Warning: {path_gz} does not exist, skipping")
+                continue
+                
+            print(f"Processing {unique_file}...")
+            
+            # Process the file with reduced memory usage
+            with record_stage("convert", unique_file, path_gz, source_dir, metrics_log) as metrics:
+                metrics["rows_in"], metrics["rows_out"] = process_vcf_in_chunks(path_gz, csv_path, chunk_size)
+            
+            print(f"Successfully created {csv_path}")
+            
+        except Exception as e:
+            print(f"Error processing {unique_file}: {str(e)}")
+
+def run(base_path=BASE_PATH, dirs=DEFAULT_DIRS, metrics_log=None, chunk_size=10000):
+    """
+    Convert the VCF files of several source directories.
+    
+    Args:
+        base_path (str): Base path for the project
+        dirs (list): Source directory names
+        metrics_log (str): Path to the JSON-lines metrics log
+        chunk_size (int): Number of lines to process at once
+    
+    Returns:
+        int: Exit status (0 on success)
+    """
+    # Process each directory
+    for source_dir in dirs:
+        dir_path = os.path.join(base_path, source_dir)
+        if not os.path.exists(dir_path):
+            print(f"Warning: Directory {dir_path} does not exist, skipping")
+            continue
+        
+        process_directory(base_path, source_dir, metrics_log, chunk_size)
+    
+    print("All directories processed successfully")
+    return 0
+
+def main():
+    """
+    Main function to parse arguments and process directories.
+    """
+    parser = argparse.ArgumentParser(description='Convert VCF files to CSV format')
+    parser.add_argument('--base-path', type=str, default=BASE_PATH,
+                        help='Base path for the project')
+    parser.add_argument('--dirs', type=str, nargs='+', 
+                        default=DEFAULT_DIRS,
+                        help='List of source directories to process')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='Number of lines to process at once (default: 10000)')
+    parser.add_argument('--memory-limit', type=int, default=7000,
+                        help='Approximate memory limit in MB (default: 7000)')
+    parser.add_argument('--metrics-log', type=str, default=None,
+                        help='JSON-lines metrics log (default: $STEP3_METRICS_LOG or step3_metrics.jsonl)')
+    
+    args = parser.parse_args()
+    
+    return run(args.base_path, args.dirs, args.metrics_log, args.chunk_size)
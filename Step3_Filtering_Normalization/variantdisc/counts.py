@@ -0,0 +1,198 @@
+"""
+This module counts mutations in CSV files across multiple source directories
+and merges the counts with metadata.
+"""
+
+import os
+import argparse
+from variantdisc.datasets import (BASE_PATH, DEFAULT_DIRS, csv_dir, mutation_counts_file,
+                                  sample_names, sra_info_file)
+from variantdisc.metrics import record_stage
+
+# UNC93B1 region used for the mutation counts
+UNC_START = 67991100
+UNC_END = 68005150
+
+
+def process_directory(base_path, dir_name, metrics_log=None, datasets=None):
+    """
+    Process mutation counts for a specific directory.
+    
+    Args:
+        base_path (str): Base project path
+        dir_name (str): Directory name (e.g., 'source_dir_4')
+        metrics_log (str): Path to the JSON-lines metrics log
+        datasets (dict): Dataset configuration (see variantdisc.datasets)
+    
+    Returns:
+        bool: True if processing was successful, False otherwise
+    """
+    import pandas as pd
+
+    # Determine the output file from the dataset configuration
+    output_file = mutation_counts_file(base_path, dir_name, datasets)
+    if output_file is None:
+        print(f"Error: Unknown directory {dir_name}")
+        return False
+    
+    print(f"Processing {dir_name}...")
+    
+    try:
+        # Set paths
+        input_dir = csv_dir(base_path, dir_name)
+        # SRA info file in /source_dir/filtered/srainfo/SraRunTable.csv
+        sra_file = sra_info_file(base_path, dir_name)
+        
+        # Check if csv directory exists
+        if not os.path.exists(input_dir):
+            print(f"Skipping {dir_name}: CSV directory not found: {input_dir}")
+            return False
+
+        # Check if output file already exists - skip if it does
+        if os.path.exists(output_file):
+            print(f"Skipping {dir_name}: Output file already exists: {output_file}")
+            return True
+            
+        # Check if SRA info file exists
+        if not os.path.exists(sra_file):
+            print(f"Skipping {dir_name}: SRA info file not found: {sra_file}")
+            return False
+        
+        # Extract unique filenames without extensions from all CSV files
+        unique_file_list = sample_names(input_dir, "*.csv")
+        
+        if not unique_file_list:
+            print(f"Skipping {dir_name}: No CSV files found in {input_dir}")
+            return False
+        
+        print(f"Found {len(unique_file_list)} unique samples in {dir_name}")
+        
+        # Create new dataframe to count number of mutations of unc and chr11
+        columns = ["Run", "unc_mut", "chr11_mut"]
+        df = pd.DataFrame(columns=columns)
+        
+        # Process each sample
+        for sample in unique_file_list:
+            sample_file = os.path.join(input_dir, f"{sample}.csv")
+            
+            if not os.path.exists(sample_file):
+                print(f"Warning: File not found for sample {sample}, skipping")
+                continue
+                
+            try:
+                with record_stage("counts", sample, sample_file, dir_name, metrics_log) as metrics:
+                    # Read the CSV file
+                    data = pd.read_csv(sample_file)
+                    
+                    # Get the total number of lines (chr11 mutations)
+                    chr11_mut = len(data)
+                    
+                    # Get the number of lines where POS is within the UNC range
+                    unc_mut = len(data[(data['POS'] >= UNC_START) & (data['POS'] <= UNC_END)])
+                    
+                    # Create a new row for the current file
+                    new_row = pd.DataFrame({"Run": [sample], "unc_mut": [unc_mut], "chr11_mut": [chr11_mut]})
+                    
+                    # Concatenate the new row to the existing DataFrame
+                    df = pd.concat([df, new_row], ignore_index=True)
+                    metrics["rows_in"], metrics["rows_out"] = chr11_mut, 1
+                
+            except Exception as e:
+                print(f"Error processing sample {sample}: {str(e)}")
+        
+        # Check if we have any data
+        if len(df) == 0:
+            print(f"Error: No mutation data collected for {dir_name}")
+            return False
+            
+        print(f"Processed {len(df)} samples with mutation counts")
+        
+        # Merge with metadata
+        try:
+            meta_data = pd.read_csv(sra_file, sep=",")
+            merged_df = pd.merge(df, meta_data, on="Run", how="left")
+            
+            # Check if merge was successful
+            if len(merged_df) != len(df):
+                print(f"Warning: Merge resulted in {len(merged_df)} rows, but expected {len(df)} rows")
+                
+            # If an existing file, create backup
+            if os.path.exists(output_file):
+                backup_file = output_file + ".bak"
+                print(f"Creating backup of existing file: {backup_file}")
+                os.rename(output_file, backup_file)
+                
+            # Save the merged CSV
+            merged_df.to_csv(output_file, index=False)
+            print(f"Successfully saved mutation counts to: {output_file}")
+            
+            return True
+            
+        except Exception as e:
+            print(f"Error merging with metadata: {str(e)}")
+            return False
+            
+    except Exception as e:
+        print(f"Error processing directory {dir_name}: {str(e)}")
+        return False
+
+
+def run(base_path=BASE_PATH, dirs=DEFAULT_DIRS, metrics_log=None, datasets=None):
+    """
+    Count mutations for several source directories.
+    
+    Args:
+        base_path (str): Base project path
+        dirs (list): Source directory names
+        metrics_log (str): Path to the JSON-lines metrics log
+        datasets (dict): Dataset configuration (see variantdisc.datasets)
+    
+    Returns:
+        int: Exit status (0 if at least one directory was processed)
+    """
+    success_count = 0
+    attempted_count = 0
+    
+    print("Starting mutation count analysis...")
+    
+    # Process each directory
+    for dir_name in dirs:
+        dir_path = os.path.join(base_path, dir_name)
+        if not os.path.exists(dir_path):
+            print(f"Skipping {dir_name}: Directory {dir_path} does not exist")
+            continue
+        
+        attempted_count += 1
+        if process_directory(base_path, dir_name, metrics_log, datasets):
+            success_count += 1
+    
+    print(f"Completed processing {success_count} out of {attempted_count} attempted directories")
+    
+    # Consider successful if at least one directory was processed
+    if success_count > 0:
+        print("Job completed successfully")
+        return 0
+    elif attempted_count == 0:
+        print("No directories were processed")
+        return 1
+    else:
+        print("Job failed - could not process any directories")
+        return 1
+
+
+def main():
+    """
+    Main function to parse arguments and process directories.
+    """
+    parser = argparse.ArgumentParser(description='Count mutations in CSV files across directories')
+    parser.add_argument('--base-path', type=str, default=BASE_PATH,
+                        help='Base path for the project')
+    parser.add_argument('--dirs', type=str, nargs='+', 
+                        default=["source_dir"],  # Changed to only process source_dir by default
+                        help='List of source directories to process')
+    parser.add_argument('--metrics-log', type=str, default=None,
+                        help='JSON-lines metrics log (default: $STEP3_METRICS_LOG or step3_metrics.jsonl)')
+    
+    args = parser.parse_args()
+    
+    return run(args.base_path, args.dirs, args.metrics_log)
@@ -0,0 +1,96 @@
+"""
+Dataset configuration and directory layout of the Step3 inputs and outputs.
+
+Each source directory of the project is described by an entry of DATASETS. Other datasets
+can be described in a JSON or YAML file passed to load_datasets, e.g.:
+
+    source_dir_7:
+      suffix: ds7
+      number: 4
+"""
+
+import os
+import glob
+import json
+
+BASE_PATH = "/work/project/ext_016/RNA-Seq-Variant-Calling_1"
+
+# suffix: used in the mutation_counts_metadata_<suffix>.csv file name
+# number: dataset number used in the merged tables (Dataset A = 1, B = 2, C = 3)
+DATASETS = {
+    "source_dir": {"suffix": "ds1", "number": 1},
+    "source_dir_4": {"suffix": "ds4", "number": 2},
+    "source_dir_6": {"suffix": "ds6", "number": 3},
+}
+
+DEFAULT_DIRS = list(DATASETS)
+
+
+def load_datasets(path=None):
+    """
+    Load the dataset configuration.
+
+    Args:
+        path (str): JSON or YAML file with additional or overriding dataset entries
+
+    Returns:
+        dict: Dataset entries keyed by source directory name
+    """
+    datasets = {name: dict(entry) for name, entry in DATASETS.items()}
+    if path is None:
+        return datasets
+
+    with open(path) as fh:
+        if path.endswith((".yaml", ".yml")):
+            import yaml
+            config = yaml.safe_load(fh) or {}
+        else:
+            config = json.load(fh)
+
+    for name, entry in config.items():
+        datasets.setdefault(name, {}).update(entry)
+    return datasets
+
+
+def dataset_suffix(dir_name, datasets=None):
+    """Return the dataset suffix of a source directory, or None if the directory is unknown."""
+    return (datasets or DATASETS).get(dir_name, {}).get("suffix")
+
+
+def filtered_dir(base_path, dir_name):
+    """Directory holding the filtered VCF files of a source directory."""
+    return os.path.join(base_path, dir_name, "filtered")
+
+
+def csv_dir(base_path, dir_name):
+    """Directory holding the per-sample variant CSV files."""
+    return os.path.join(filtered_dir(base_path, dir_name), "csv_files")
+
+
+def confidence_dir(base_path, dir_name):
+    """Directory holding the per-sample confidence CSV files."""
+    return os.path.join(filtered_dir(base_path, dir_name), "Confidence")
+
+
+def pass2_dir(base_path, dir_name):
+    """Directory holding the second pass BAM files and their coverage files."""
+    return os.path.join(base_path, dir_name, "pass2")
+
+
+def sra_info_file(base_path, dir_name):
+    """SRA run table with the sample metadata."""
+    return os.path.join(filtered_dir(base_path, dir_name), "srainfo", "SraRunTable.csv")
+
+
+def mutation_counts_file(base_path, dir_name, datasets=None):
+    """Mutation counts + metadata table of a source directory, or None if the directory is unknown."""
+    suffix = dataset_suffix(dir_name, datasets)
+    if suffix is None:
+        return None
+    return os.path.join(filtered_dir(base_path, dir_name), f"mutation_counts_metadata_{suffix}.csv")
+
+
+def sample_names(directory, pattern="*.csv"):
+    """Return the unique sample names (file names up to the first dot) matching a pattern."""
+    return list(set([os.path.basename(file_path).split(".")[0]
+                     for file_path in glob.glob(os.path.join(directory, pattern))]))
@@ -0,0 +1,87 @@
+"""
+Loaders for the Step3 outputs, shared by the notebooks.
+"""
+
+import os
+from variantdisc.datasets import (DATASETS, confidence_dir, csv_dir, mutation_counts_file,
+                                  sample_names, sra_info_file)
+from variantdisc.confidence import POS_MAX, POS_MIN
+
+
+def load_variants(base_path, dir_name, sample):
+    """Load the chr11 variant CSV of a sample."""
+    import pandas as pd
+    return pd.read_csv(os.path.join(csv_dir(base_path, dir_name), f"{sample}.csv"))
+
+
+def load_confidence(base_path, dir_name, sample):
+    """Load the confidence scores of a sample."""
+    import pandas as pd
+    return pd.read_csv(os.path.join(confidence_dir(base_path, dir_name), f"{sample}_confidence.csv"))
+
+
+def load_metadata(base_path, dir_name):
+    """Load the SRA run table of a source directory."""
+    import pandas as pd
+    return pd.read_csv(sra_info_file(base_path, dir_name))
+
+
+def load_mutation_counts(base_path, dir_name, datasets=None):
+    """Load the mutation counts + metadata (+ coverage) table of a source directory."""
+    import pandas as pd
+    return pd.read_csv(mutation_counts_file(base_path, dir_name, datasets))
+
+
+def load_coverage(coverage_file):
+    """Load a samtools depth output file."""
+    import pandas as pd
+    df = pd.read_csv(coverage_file, sep='\t', header=None)
+    df.columns = ['chromosome', 'position', 'coverage']
+    return df
+
+
+def load_confidence_table(base_path, dir_name, datasets=None, pos_min=POS_MIN, pos_max=POS_MAX):
+    """
+    Merge the confidence scores of all samples of a source directory with their REF/ALT alleles
+    and disease status (one row per variant).
+
+    Args:
+        base_path (str): Base project path
+        dir_name (str): Directory name (e.g., 'source_dir_6')
+        datasets (dict): Dataset configuration (see variantdisc.datasets)
+        pos_min (int): First position of the region
+        pos_max (int): Last position of the region
+
+    Returns:
+        pandas.DataFrame: Merged table
+    """
+    import pandas as pd
+
+    dataset_number = (datasets or DATASETS).get(dir_name, {}).get("number")
+    metadata = load_metadata(base_path, dir_name)
+    disease = metadata.set_index("Run")["disease"]
+
+    results = []
+    for sample in sample_names(csv_dir(base_path, dir_name), "*.csv"):
+        temp = load_variants(base_path, dir_name, sample)
+        temp_confidence = load_confidence(base_path, dir_name, sample)
+
+        # Filter positions
+        filtered_temp = temp[(temp["POS"] >= pos_min) & (temp["POS"] <= pos_max)]
+
+        # Merge dataframes
+        merged_df = temp_confidence.merge(filtered_temp[['POS', 'REF', 'ALT']], on='POS', how='left')
+
+        # Add constant columns
+        merged_df['Dataset'] = dataset_number
+        merged_df['Run'] = sample
+        merged_df['Disease'] = disease.get(sample)
+
+        results.append(merged_df[['Dataset', 'Run', 'Disease', 'POS', 'REF', 'ALT', 'GQ', 'QUAL', 'DP',
+                                  'gq_conf', 'qual_conf', 'dp_conf', 'confidence', 'FILTER']])
+
+    # Combine all results at once
+    df = pd.concat(results, ignore_index=True)
+    df.loc[df["Disease"] == "systemic lupus erythematosus", "Disease"] = "SLE"
+    df.loc[df["Disease"] == "healthy", "Disease"] = "Healthy"
+    return df
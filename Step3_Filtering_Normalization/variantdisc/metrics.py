@@ -0,0 +1,254 @@
+"""
+This module records per-sample metrics for the Step3 stages and summarizes them.
+Every processed sample and stage is written as one JSON line holding the duration, input size,
+rows in/out and memory of the stage. 'variantdisc metrics' finds the slow, oversized and
+memory-heavy samples in a metrics log.
+"""
+
+import os
+import json
+import time
+import socket
+import argparse
+import threading
+import statistics
+from contextlib import contextmanager
+
+# Metrics log used when no path is given explicitly.
+METRICS_ENV = "STEP3_METRICS_LOG"
+DEFAULT_METRICS_LOG = "step3_metrics.jsonl"
+
+# Interval in seconds between two samples of the resident set size during a stage.
+RSS_INTERVAL = 0.05
+
+
+def metrics_log_path(path=None):
+    """Return the metrics log path: the given path, $STEP3_METRICS_LOG or the default."""
+    return path or os.environ.get(METRICS_ENV) or DEFAULT_METRICS_LOG
+
+
+def current_rss_mb():
+    """Current resident set size of the process in MB, or None where /proc/self/statm is missing."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@contextmanager
+def track_rss(interval=RSS_INTERVAL):
+    """
+    Context manager sampling the resident set size of the process in a background thread.
+
+    Unlike ru_maxrss, which is the peak over the whole process lifetime, the peak is reset for
+    every stage, so a sample processed after a large one still gets its own peak.
+
+    Yields:
+        dict: 'start' and 'peak' RSS in MB (None if the RSS cannot be read), updated until exit
+    """
+    usage = {"start": current_rss_mb(), "peak": None}
+    usage["peak"] = usage["start"]
+    if usage["start"] is None:
+        yield usage
+        return
+
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(interval):
+            usage["peak"] = max(usage["peak"], current_rss_mb() or 0)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield usage
+    finally:
+        stop.set()
+        sampler.join()
+        usage["peak"] = max(usage["peak"], current_rss_mb() or 0)
+
+
+def write_record(record, path=None):
+    """
+    Append one metrics record as a JSON line.
+
+    Args:
+        record (dict): Metrics record
+        path (str): Metrics log path (see metrics_log_path)
+    """
+    path = metrics_log_path(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a") as fh:
+        fh.write(json.dumps(record) + "\n")
+
+
+@contextmanager
+def record_stage(stage, sample, input_path=None, dataset=None, path=None):
+    """
+    Context manager timing one sample through one stage and logging the result.
+
+    The yielded record can be updated by the caller, typically with 'rows_in' and 'rows_out'.
+    A record is written even if the stage raises; its status is then 'error'.
+
+    Args:
+        stage (str): Stage name (e.g. 'convert', 'confidence')
+        sample (str): Sample name
+        input_path (str): Input file of the stage, used for the input size
+        dataset (str): Source directory or dataset of the sample
+        path (str): Metrics log path (see metrics_log_path)
+    """
+    record = {
+        "stage": stage,
+        "sample": sample,
+        "dataset": dataset,
+        "input": input_path,
+        "input_bytes": os.path.getsize(input_path) if input_path and os.path.exists(input_path) else None,
+        "rows_in": None,
+        "rows_out": None,
+        "host": socket.gethostname(),
+        "job_id": os.environ.get("SLURM_JOB_ID"),
+        "status": "ok",
+    }
+    start = time.time()
+    try:
+        with track_rss() as usage:
+            yield record
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+        raise
+    finally:
+        record["start"] = round(start, 3)
+        record["duration_s"] = round(time.time() - start, 3)
+        # Peak RSS during this stage, and its growth over the RSS at the start of the stage
+        record["peak_rss_mb"] = round(usage["peak"], 1) if usage["peak"] is not None else None
+        record["rss_delta_mb"] = (round(usage["peak"] - usage["start"], 1)
+                                  if usage["start"] is not None else None)
+        try:
+            write_record(record, path)
+        except OSError as e:
+            print(f"Warning: could not write metrics to {metrics_log_path(path)}: {str(e)}")
+
+
+def load_records(path):
+    """Read the records of a metrics log, skipping malformed lines."""
+    records = []
+    with open(path) as fh:
+        for line in fh:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def find_outliers(records, field, factor):
+    """
+    Find the records whose value is more than 'factor' times the median of their stage.
+
+    Args:
+        records (list): Metrics records
+        field (str): Record field to compare (e.g. 'duration_s', 'input_bytes', 'rss_delta_mb')
+        factor (float): Multiple of the stage median above which a record is an outlier
+
+    Returns:
+        list: (record, stage median) pairs, largest value first
+    """
+    by_stage = {}
+    for record in records:
+        if record.get(field) is not None:
+            by_stage.setdefault(record["stage"], []).append(record)
+
+    outliers = []
+    for stage_records in by_stage.values():
+        median = statistics.median(r[field] for r in stage_records)
+        for record in stage_records:
+            if median > 0 and record[field] > factor * median:
+                outliers.append((record, median))
+    return sorted(outliers, key=lambda o: o[0][field], reverse=True)
+
+
+def summarize(records, factor=3.0, top=10):
+    """
+    Print per-stage totals, the slowest samples and the slow, oversized and memory-heavy outliers.
+
+    Args:
+        records (list): Metrics records
+        factor (float): Multiple of the stage median used to flag outliers
+        top (int): Number of slowest samples to list
+    """
+    print(f"{'stage':<24}{'samples':>8}{'errors':>8}{'total_s':>12}{'median_s':>10}{'max_rss_mb':>12}")
+    stages = {}
+    for record in records:
+        stages.setdefault(record["stage"], []).append(record)
+    for stage, stage_records in sorted(stages.items()):
+        durations = [r["duration_s"] for r in stage_records]
+        errors = sum(1 for r in stage_records if r.get("status") != "ok")
+        max_rss = max(r.get("peak_rss_mb") or 0 for r in stage_records)
+        print(f"{stage:<24}{len(stage_records):>8}{errors:>8}{sum(durations):>12.1f}"
+              f"{statistics.median(durations):>10.1f}{max_rss:>12.1f}")
+
+    print(f"\nSlowest {top} samples:")
+    for record in sorted(records, key=lambda r: r["duration_s"], reverse=True)[:top]:
+        print(f"  {record['stage']:<24}{record['sample']:<24}{record['duration_s']:>10.1f} s")
+
+    print(f"\nSlow samples (> {factor}x stage median duration):")
+    for record, median in find_outliers(records, "duration_s", factor):
+        print(f"  {record['stage']:<24}{record['sample']:<24}{record['duration_s']:>10.1f} s (median {median:.1f} s)")
+
+    print(f"\nOversized samples (> {factor}x stage median input size):")
+    for record, median in find_outliers(records, "input_bytes", factor):
+        print(f"  {record['stage']:<24}{record['sample']:<24}{record['input_bytes'] / 1e6:>10.1f} MB "
+              f"(median {median / 1e6:.1f} MB)")
+
+    print(f"\nMemory-heavy samples (> {factor}x stage median RSS growth):")
+    for record, median in find_outliers(records, "rss_delta_mb", factor):
+        print(f"  {record['stage']:<24}{record['sample']:<24}{record['rss_delta_mb']:>10.1f} MB "
+              f"(median {median:.1f} MB, peak {record.get('peak_rss_mb') or 0:.1f} MB)")
+
+
+def summarize_log(path=None, factor=3.0, top=10):
+    """
+    Summarize a metrics log (see summarize).
+
+    Args:
+        path (str): Metrics log path (see metrics_log_path)
+        factor (float): Multiple of the stage median used to flag outliers
+        top (int): Number of slowest samples to list
+
+    Returns:
+        int: Exit status (1 if the log is missing or empty)
+    """
+    path = metrics_log_path(path)
+    if not os.path.exists(path):
+        print(f"Error: Metrics log not found: {path}")
+        return 1
+
+    records = load_records(path)
+    if not records:
+        print(f"Error: No metrics records in {path}")
+        return 1
+
+    summarize(records, factor, top)
+    return 0
+
+
+def main():
+    """
+    Main function to parse arguments and summarize a metrics log.
+    """
+    parser = argparse.ArgumentParser(description='Summarize the per-sample metrics of the Step3 stages')
+    parser.add_argument('metrics_log', type=str, nargs='?', default=None,
+                        help=f'Metrics log (default: ${METRICS_ENV} or {DEFAULT_METRICS_LOG})')
+    parser.add_argument('--factor', type=float, default=3.0,
+                        help='Flag samples above this multiple of the stage median (default: 3.0)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of slowest samples to list (default: 10)')
+
+    args = parser.parse_args()
+
+    return summarize_log(args.metrics_log, args.factor, args.top)